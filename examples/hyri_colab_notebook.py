@@ -2,18 +2,35 @@
 # Simple NeuroGlyph Demo for Google Colab
 # =====================================
 
-# Install required packages
-!pip install openai anthropic ipywidgets
+# Install required packages ("httpx[http2]" pulls in h2, which the
+# shared HTTP/2 client below needs)
+!pip install openai anthropic ipywidgets tiktoken "httpx[http2]"
 
 import re
+import sys
+import html
 import json
+import time
+import asyncio
 import datetime
+import collections
+import numpy as np  # preinstalled on Colab
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 import ipywidgets as widgets
 from IPython.display import display, HTML, clear_output
 
+try:
+    # Optional: C-accelerated JSON for conversation export
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # Configuration
 print("🧠 HyRI - Hybrid Relational Intelligence")
 print("=" * 50)
@@ -25,99 +42,219 @@ class AgentType(Enum):
     GPT = "gpt"
     CLAUDE = "claude"
 
-@dataclass
+# Display icon per agent type, resolved once when a message is built
+_AGENT_EMOJI = {AgentType.HUMAN: "👤", AgentType.GPT: "🤖", AgentType.CLAUDE: "🎭"}
+
+@dataclass(slots=True)
 class NeuroGlyphMessage:
-    """Represents a parsed NeuroGlyph message"""
-    timestamp: str
+    """Represents a parsed NeuroGlyph message.
+
+    agent_type holds the interned AgentType *value* string; the enum stays
+    in use at the API boundary. slots=True drops the per-instance dict.
+    Timestamps are stored as a cheap integer and formatted only on demand.
+    """
+    timestamp_ns: int
     agent: str
-    agent_type: AgentType
+    agent_type: str
     tokens: Dict[str, Any]
     raw_text: str
     is_valid: bool = True
-    validation_errors: List[str] = None
-
-    def __post_init__(self):
-        if self.validation_errors is None:
-            self.validation_errors = []
+    validation_errors: List[str] = field(default_factory=list)
+    agent_emoji: str = "⚙️"
+
+    @property
+    def iso_time(self) -> str:
+        """ISO-formatted timestamp, built lazily for display/export"""
+        return datetime.datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat()
+
+    @property
+    def clock_time(self) -> str:
+        """HH:MM:SS wall-clock form for the message header"""
+        return time.strftime('%H:%M:%S', time.localtime(self.timestamp_ns // 1_000_000_000))
+
+    def to_json_dict(self):
+        """Plain-dict form for JSON export, without asdict's deep copies"""
+        return {
+            'timestamp': self.iso_time,
+            'agent': self.agent,
+            'agent_type': self.agent_type,
+            'tokens': self.tokens,
+            'raw_text': self.raw_text,
+            'is_valid': self.is_valid,
+            'validation_errors': self.validation_errors
+        }
 
 class NeuroGlyphParser:
     """Simple NeuroGlyph parser for Colab"""
     
-    # Core tokens (simplified for demo)
-    CORE_TOKENS = {
+    # Core tokens (simplified for demo). The slash forms are interned so
+    # every parsed token key hits CPython's identity fast path in dict
+    # lookups instead of a full string compare.
+    CORE_TOKENS = {_e: sys.intern(_s) for _e, _s in {
         '🧠': '/mind', '📚': '/focus', '🎯': '/context', '💡': '/intent',
         '📦': '/deliverable', '❓': '/query', '🚀': '/act', '⏰': '/timeline',
         '🔥': '/pulse', '🤝': '/trust', '📝': '/note', '🔍': '/introspect'
-    }
-    
+    }.items()}
+
     SLASH_TO_EMOJI = {v: k for k, v in CORE_TOKENS.items()}
-    
+
+    # One precompiled scan pulls out every "token: value" line at C level,
+    # replacing the per-line split/strip loop
+    _LINE_RE = re.compile(r'(?m)^[ \t]*(\S+)[ \t]*:[ \t]*(.*?)[ \t]*$')
+
+    # Validation as data: (trigger token, required tokens, error message).
+    # New rules are one tuple here instead of another if-branch below.
+    _RULES = (
+        ('/act', frozenset({'/intent'}), "Action requires /intent"),
+    )
+
     def parse_message(self, text: str, agent: str, agent_type: AgentType) -> NeuroGlyphMessage:
         """Parse a NeuroGlyph message and extract tokens"""
-        tokens = {}
         validation_errors = []
-        
-        lines = text.strip().split('\n')
-        for line in lines:
-            if ':' in line:
-                token_part, value = line.split(':', 1)
-                token_part = token_part.strip()
-                value = value.strip()
-                
-                # Convert emoji to slash notation if needed
-                token = self.CORE_TOKENS.get(token_part, token_part)
-                tokens[token] = value
-        
-        # Simple validation
+
+        # Convert emoji to slash notation if needed; bind the lookup once
+        # so the comprehension avoids LOAD_ATTR per line
+        _get = self.CORE_TOKENS.get
+        tokens = {_get(key, key): value
+                  for key, value in self._LINE_RE.findall(text)}
+
+        # Rule-table validation
         is_valid = True
-        if '/act' in tokens and '/intent' not in tokens:
-            validation_errors.append("Action requires /intent")
-            is_valid = False
-        
+        for trigger, required, error in self._RULES:
+            if trigger in tokens and not required <= tokens.keys():
+                validation_errors.append(error)
+                is_valid = False
+
         return NeuroGlyphMessage(
-            timestamp=datetime.datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             agent=agent,
-            agent_type=agent_type,
+            agent_type=sys.intern(agent_type.value),
             tokens=tokens,
             raw_text=text,
             is_valid=is_valid,
-            validation_errors=validation_errors
+            validation_errors=validation_errors,
+            agent_emoji=_AGENT_EMOJI.get(agent_type, "⚙️")
         )
     
     def format_tokens(self, tokens: Dict[str, Any]) -> str:
         """Format tokens back to NeuroGlyph"""
-        lines = []
-        for token, value in tokens.items():
-            emoji = self.SLASH_TO_EMOJI.get(token, token)
-            lines.append(f"{emoji}: {value}")
-        return '\n'.join(lines)
+        # Bind the lookup once so the loop avoids LOAD_ATTR per token
+        _get = self.SLASH_TO_EMOJI.get
+        return '\n'.join(f"{_get(token, token)}: {value}"
+                         for token, value in tokens.items())
+
+# Styles emitted once per notebook; per-message markup only carries class
+# names, which keeps each rendered message a fraction of the old inline-style
+# size
+_CHAT_CSS = """
+<style>
+.ng-msg { border: 1px solid #ddd; padding: 10px; margin: 5px 0; border-radius: 5px; background-color: #f9f9f9; }
+.ng-hdr { font-weight: bold; color: #333; }
+.ng-hdr span { font-size: 0.8em; color: #666; }
+.ng-body { margin-top: 5px; font-family: monospace; white-space: pre-line; }
+.ng-err { color: orange; font-size: 0.9em; }
+</style>
+"""
+
+# Message HTML skeleton built once; display_message only fills in the
+# variable parts
+_MSG_TPL = """
+<div class="ng-msg">
+    <div class="ng-hdr">{agent_emoji} {agent} <span>({ts})</span></div>
+    <div class="ng-body">
+{raw}
+    </div>
+    {errors}
+</div>
+"""
+
+# Static NeuroGlyph spec, kept byte-identical across calls so provider-side
+# prompt caching can reuse it; it is sent as the system prompt head for
+# OpenAI and as a cache_control block for Anthropic
+_STATIC_SPEC = (
+    "You are participating in a NeuroGlyph conversation.\n"
+    "NeuroGlyph is a structured protocol for human-AI dialogue.\n"
+    "Each line of a message is `token: value`. Core tokens:\n"
+    "🧠 /mind: participants    💡 /intent: purpose\n"
+    "📚 /focus: topic          📦 /deliverable: expected output\n"
+    "🎯 /context: situation    ❓ /query: question\n"
+    "🚀 /act: action           ⏰ /timeline: time frame\n"
+    "🔥 /pulse: priority       🤝 /trust: trust level\n"
+    "📝 /note: aside           🔍 /introspect: reflection\n"
+    "A message containing 🚀 /act must also state 💡 /intent.\n"
+    "Please respond using NeuroGlyph tokens like 🧠: agent_name, 📚: topic, 💡: intent, etc.\n"
+)
+
+# Both constants are built once at import; per-turn prompt assembly is
+# just concatenation, and editing either invalidates provider caches
+_STATIC_PREFIX = "Recent conversation:\n"
 
 class SimpleHyRI:
     """Simplified HyRI engine for Colab demo"""
-    
+
     def __init__(self):
         self.parser = NeuroGlyphParser()
-        self.conversation_history = []
+        # Bounded history: hours-long Colab sessions stop accumulating
+        # messages without limit, with O(1) eviction of the oldest
+        self.conversation_history = collections.deque(maxlen=500)
+        # Preformatted recent lines with their token counts; context is
+        # maintained, not recomputed, and packed against a real token budget
+        self._ctx_lines = collections.deque(maxlen=20)
+        # Token keysets parallel to conversation_history, for vectorized
+        # whole-history checks without touching the message objects
+        self._token_keysets = collections.deque(maxlen=500)
+        self.context_token_budget = 2000
+        try:
+            import tiktoken
+            self._enc = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            self._enc = None
         self.openai_client = None
         self.anthropic_client = None
+        self.openai_async = None
+        self.anthropic_async = None
+        self._http = None
+        # Persistent chat area; when set, messages render inside it instead
+        # of pushing new top-level outputs into the notebook
+        self.chat_output = None
+        # Context string memo, invalidated by add_message; the Both Agents
+        # path calls get_conversation_context twice back to back
+        self._ctx_cache = None
     
     def set_api_keys(self, openai_key: str = "", anthropic_key: str = ""):
         """Set API keys for AI services"""
+        if (openai_key or anthropic_key) and self._http is None:
+            # One pooled HTTP/2 client shared by both async SDKs: keep-alive
+            # skips TLS setup on subsequent calls and HTTP/2 multiplexes
+            # the concurrent GPT+Claude requests
+            import httpx
+            self._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+                timeout=30.0
+            )
+
         if openai_key:
             import openai
             self.openai_client = openai.OpenAI(api_key=openai_key)
+            self.openai_async = openai.AsyncOpenAI(api_key=openai_key, http_client=self._http)
             print("✅ OpenAI client initialized")
-        
+
         if anthropic_key:
             import anthropic
             self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
+            self.anthropic_async = anthropic.AsyncAnthropic(api_key=anthropic_key, http_client=self._http)
             print("✅ Anthropic client initialized")
     
     def add_message(self, text: str, agent: str, agent_type: AgentType):
         """Add a message to conversation"""
         message = self.parser.parse_message(text, agent, agent_type)
         self.conversation_history.append(message)
-        
+        self._token_keysets.append(frozenset(message.tokens))
+        line = f"[{agent}]: {text}"
+        self._ctx_lines.append((line, self._count_tokens(line)))
+        self._ctx_cache = None
+
         # Display the message
         self.display_message(message)
         
@@ -125,34 +262,65 @@ class SimpleHyRI:
     
     def display_message(self, message: NeuroGlyphMessage):
         """Display a message in Colab"""
-        agent_emoji = {"human": "👤", "gpt": "🤖", "claude": "🎭"}.get(message.agent_type.value, "⚙️")
-        
-        html = f"""
-        <div style="border: 1px solid #ddd; padding: 10px; margin: 5px 0; border-radius: 5px; background-color: #f9f9f9;">
-            <div style="font-weight: bold; color: #333;">
-                {agent_emoji} {message.agent} <span style="font-size: 0.8em; color: #666;">({message.timestamp.split('T')[1][:8]})</span>
-            </div>
-            <div style="margin-top: 5px; font-family: monospace; white-space: pre-line;">
-{message.raw_text}
-            </div>
-            {f'<div style="color: orange; font-size: 0.9em;">⚠️ {", ".join(message.validation_errors)}</div>' if not message.is_valid else ''}
-        </div>
-        """
-        display(HTML(html))
+        errors = ''
+        if not message.is_valid:
+            errors = ('<div class="ng-err">⚠️ '
+                      f'{html.escape(", ".join(message.validation_errors))}</div>')
+
+        if self.chat_output is not None:
+            with self.chat_output:
+                self._render(message, errors)
+        else:
+            self._render(message, errors)
+
+    def _render(self, message: NeuroGlyphMessage, errors: str):
+        display(HTML(_MSG_TPL.format(
+            agent_emoji=message.agent_emoji,
+            agent=html.escape(message.agent),
+            ts=message.clock_time,
+            raw=html.escape(message.raw_text),
+            errors=errors
+        )))
     
+    def _count_tokens(self, text: str) -> int:
+        """BPE token count (cl100k_base), or a chars/4 estimate without tiktoken"""
+        if self._enc is not None:
+            return len(self._enc.encode(text))
+        return max(1, len(text) // 4)
+
     def get_conversation_context(self) -> str:
-        """Build context for AI agents"""
-        context = [
-            "You are participating in a NeuroGlyph conversation.",
-            "NeuroGlyph is a structured protocol for human-AI dialogue.",
-            "Please respond using NeuroGlyph tokens like 🧠: agent_name, 📚: topic, 💡: intent, etc.",
-            "Recent conversation:"
-        ]
-        
-        for msg in self.conversation_history[-3:]:
-            context.append(f"[{msg.agent}]: {msg.raw_text}")
-        
-        return '\n'.join(context)
+        """Build context for AI agents, packing recent messages into the token budget"""
+        if self._ctx_cache is not None:
+            return self._ctx_cache
+        selected = []
+        budget = self.context_token_budget
+        for line, n_tokens in reversed(self._ctx_lines):
+            if n_tokens > budget and selected:
+                break
+            budget -= n_tokens
+            selected.append(line)
+        selected.reverse()
+        self._ctx_cache = _STATIC_PREFIX + '\n'.join(selected)
+        return self._ctx_cache
+
+    def bulk_validation_stats(self) -> Dict[str, int]:
+        """Re-check validation rules across the whole history at once.
+
+        Builds boolean masks over the parallel _token_keysets deque, so a
+        500-message sweep is a couple of numpy ops instead of a Python
+        loop per message per rule.
+        """
+        n = len(self._token_keysets)
+        if n == 0:
+            return {'messages': 0, 'act_without_intent': 0}
+        has_act = np.fromiter(('/act' in ks for ks in self._token_keysets),
+                              dtype=bool, count=n)
+        has_intent = np.fromiter(('/intent' in ks for ks in self._token_keysets),
+                                 dtype=bool, count=n)
+        return {
+            'messages': n,
+            'act_without_intent': int(np.count_nonzero(has_act & ~has_intent)),
+        }
     
     def get_gpt_response(self, prompt: str = "") -> str:
         """Get GPT response"""
@@ -163,7 +331,7 @@ class SimpleHyRI:
             response = self.openai_client.chat.completions.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": self.get_conversation_context()},
+                    {"role": "system", "content": _STATIC_SPEC + self.get_conversation_context()},
                     {"role": "user", "content": prompt or "Continue the NeuroGlyph conversation"}
                 ],
                 max_tokens=300
@@ -181,8 +349,12 @@ class SimpleHyRI:
             message = self.anthropic_client.messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=300,
+                # The static spec is marked cacheable so Anthropic only
+                # reprocesses the (short) per-turn context
+                system=[{"type": "text", "text": _STATIC_SPEC,
+                         "cache_control": {"type": "ephemeral"}}],
                 messages=[{
-                    "role": "user", 
+                    "role": "user",
                     "content": f"{self.get_conversation_context()}\n\nHuman: {prompt or 'Continue the conversation'}"
                 }]
             )
@@ -190,166 +362,242 @@ class SimpleHyRI:
         except Exception as e:
             return f"❌ Claude Error: {str(e)}"
     
+    async def _gpt_async(self, prompt: str = "") -> str:
+        """Async GPT call (mirrors get_gpt_response)"""
+        if not self.openai_async:
+            return "❌ OpenAI client not configured"
+
+        try:
+            response = await self.openai_async.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": _STATIC_SPEC + self.get_conversation_context()},
+                    {"role": "user", "content": prompt or "Continue the NeuroGlyph conversation"}
+                ],
+                max_tokens=300
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"❌ GPT Error: {str(e)}"
+
+    async def _claude_async(self, prompt: str = "") -> str:
+        """Async Claude call (mirrors get_claude_response)"""
+        if not self.anthropic_async:
+            return "❌ Anthropic client not configured"
+
+        try:
+            message = await self.anthropic_async.messages.create(
+                model="claude-3-sonnet-20240229",
+                max_tokens=300,
+                system=[{"type": "text", "text": _STATIC_SPEC,
+                         "cache_control": {"type": "ephemeral"}}],
+                messages=[{
+                    "role": "user",
+                    "content": f"{self.get_conversation_context()}\n\nHuman: {prompt or 'Continue the conversation'}"
+                }]
+            )
+            return message.content[0].text
+        except Exception as e:
+            return f"❌ Claude Error: {str(e)}"
+
+    async def get_both_async(self, prompt: str = ""):
+        """Run GPT and Claude concurrently; wall time ≈ the slower call"""
+        results = await asyncio.gather(
+            self._gpt_async(prompt), self._claude_async(prompt),
+            return_exceptions=True
+        )
+        return [f"❌ Error: {r}" if isinstance(r, Exception) else r for r in results]
+
     def export_conversation(self) -> str:
         """Export conversation as JSON"""
         data = {
             'conversation_id': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
-            'messages': [asdict(msg) for msg in self.conversation_history]
+            'messages': [msg.to_json_dict() for msg in self.conversation_history]
         }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return _dumps(data)
 
 # Initialize HyRI
 hyri = SimpleHyRI()
 
-# Setup UI
-print("\n🔧 Setup")
-print("Enter your API keys below (at least one required):")
-
-# API Key input
-openai_key_widget = widgets.Password(
-    placeholder="sk-...",
-    description="OpenAI Key:",
-    style={'description_width': 'initial'}
-)
-
-anthropic_key_widget = widgets.Password(
-    placeholder="sk-ant-api-...", 
-    description="Anthropic Key:",
-    style={'description_width': 'initial'}
-)
-
-setup_button = widgets.Button(
-    description="Initialize HyRI",
-    button_style='success'
-)
-
-def setup_hyri(b):
-    with setup_output:
-        clear_output()
-        hyri.set_api_keys(openai_key_widget.value, anthropic_key_widget.value)
-        if hyri.openai_client or hyri.anthropic_client:
-            print("🚀 HyRI is ready! Start your NeuroGlyph conversation below.")
-        else:
-            print("❌ Please provide at least one API key")
-
-setup_button.on_click(setup_hyri)
-setup_output = widgets.Output()
-
-display(openai_key_widget, anthropic_key_widget, setup_button, setup_output)
-
-print("\n💬 Conversation Interface")
-print("Use NeuroGlyph tokens in your messages:")
-
-# Message input
-message_widget = widgets.Textarea(
-    placeholder="""🧠: Human
+# Widgets are built once and cached; re-running the UI cell calls
+# build_ui() again, which redisplays the same widgets instead of leaking
+# duplicates with stale click handlers still attached
+_ui = None
+
+def _make_ui():
+    """Create all widgets and wire their handlers (called once)"""
+    # API Key input
+    openai_key_widget = widgets.Password(
+        placeholder="sk-...",
+        description="OpenAI Key:",
+        style={'description_width': 'initial'}
+    )
+
+    anthropic_key_widget = widgets.Password(
+        placeholder="sk-ant-api-...",
+        description="Anthropic Key:",
+        style={'description_width': 'initial'}
+    )
+
+    setup_button = widgets.Button(
+        description="Initialize HyRI",
+        button_style='success'
+    )
+
+    setup_output = widgets.Output()
+
+    def setup_hyri(b):
+        with setup_output:
+            clear_output()
+            hyri.set_api_keys(openai_key_widget.value, anthropic_key_widget.value)
+            if hyri.openai_client or hyri.anthropic_client:
+                print("🚀 HyRI is ready! Start your NeuroGlyph conversation below.")
+            else:
+                print("❌ Please provide at least one API key")
+
+    setup_button.on_click(setup_hyri)
+
+    # Message input
+    message_widget = widgets.Textarea(
+        placeholder="""🧠: Human
 📚: artificial_consciousness
 💡: exploring_AI_awareness
 🎯: philosophical_dialogue
 📦: insights_and_questions
 ❓: Can AI agents truly understand or just simulate understanding?""",
-    layout=widgets.Layout(width='100%', height='120px'),
-    description="Your Message:"
-)
-
-# Buttons
-send_button = widgets.Button(description="📤 Send", button_style='primary')
-gpt_button = widgets.Button(description="🤖 Get GPT Response", button_style='info')
-claude_button = widgets.Button(description="🎭 Get Claude Response", button_style='info')
-both_button = widgets.Button(description="🔄 Both Agents", button_style='warning')
-
-# Button functions
-def send_message(b):
-    if message_widget.value.strip():
-        hyri.add_message(message_widget.value, "Human", AgentType.HUMAN)
-        message_widget.value = ""
-
-def get_gpt_response(b):
-    response = hyri.get_gpt_response()
-    hyri.add_message(response, "GPT-4", AgentType.GPT)
-
-def get_claude_response(b):
-    response = hyri.get_claude_response()
-    hyri.add_message(response, "Claude", AgentType.CLAUDE)
-
-def get_both_responses(b):
-    if hyri.openai_client:
-        gpt_response = hyri.get_gpt_response()
-        hyri.add_message(gpt_response, "GPT-4", AgentType.GPT)
-    
-    if hyri.anthropic_client:
-        claude_response = hyri.get_claude_response()
-        hyri.add_message(claude_response, "Claude", AgentType.CLAUDE)
-
-send_button.on_click(send_message)
-gpt_button.on_click(get_gpt_response)
-claude_button.on_click(get_claude_response)
-both_button.on_click(get_both_responses)
-
-button_box = widgets.HBox([send_button, gpt_button, claude_button, both_button])
-display(message_widget, button_box)
-
-print("\n📖 NeuroGlyph Token Reference:")
-print("🧠 /mind: Participants    💡 /intent: Purpose")
-print("📚 /focus: Topic          📦 /deliverable: Output") 
-print("🎯 /context: Situation    ❓ /query: Question")
-print("🚀 /act: Action           ⏰ /timeline: Time")
-print("🔥 /pulse: Priority       🤝 /trust: Trust level")
-
-print("\n✨ Example Templates:")
-
-example1 = widgets.Button(description="📚 Philosophy Question", button_style='')
-example2 = widgets.Button(description="🚀 Project Planning", button_style='')
-example3 = widgets.Button(description="🔍 Research Query", button_style='')
-
-def load_example1(b):
-    message_widget.value = """🧠: Human
+        layout=widgets.Layout(width='100%', height='120px'),
+        description="Your Message:"
+    )
+
+    # Buttons
+    send_button = widgets.Button(description="📤 Send", button_style='primary')
+    gpt_button = widgets.Button(description="🤖 Get GPT Response", button_style='info')
+    claude_button = widgets.Button(description="🎭 Get Claude Response", button_style='info')
+    both_button = widgets.Button(description="🔄 Both Agents", button_style='warning')
+
+    # Button functions
+    def send_message(b):
+        if message_widget.value.strip():
+            hyri.add_message(message_widget.value, "Human", AgentType.HUMAN)
+            message_widget.value = ""
+
+    def get_gpt_response(b):
+        response = hyri.get_gpt_response()
+        hyri.add_message(response, "GPT-4", AgentType.GPT)
+
+    def get_claude_response(b):
+        response = hyri.get_claude_response()
+        hyri.add_message(response, "Claude", AgentType.CLAUDE)
+
+    def get_both_responses(b):
+        async def _run():
+            gpt_response, claude_response = await hyri.get_both_async()
+            if hyri.openai_client:
+                hyri.add_message(gpt_response, "GPT-4", AgentType.GPT)
+            if hyri.anthropic_client:
+                hyri.add_message(claude_response, "Claude", AgentType.CLAUDE)
+
+        # Jupyter/Colab already runs an event loop, so schedule on it
+        asyncio.ensure_future(_run())
+
+    send_button.on_click(send_message)
+    gpt_button.on_click(get_gpt_response)
+    claude_button.on_click(get_claude_response)
+    both_button.on_click(get_both_responses)
+
+    button_box = widgets.HBox([send_button, gpt_button, claude_button, both_button])
+
+    # One persistent output area for the whole chat: each message is appended
+    # inside it rather than emitted as a new top-level cell output
+    chat_output = widgets.Output(layout={'border': '1px solid #eee'})
+    hyri.chat_output = chat_output
+
+    example1 = widgets.Button(description="📚 Philosophy Question", button_style='')
+    example2 = widgets.Button(description="🚀 Project Planning", button_style='')
+    example3 = widgets.Button(description="🔍 Research Query", button_style='')
+
+    def load_example1(b):
+        message_widget.value = """🧠: Human
 📚: consciousness_and_AI
 💡: exploring_philosophical_implications
 🎯: academic_dialogue
 📦: theoretical_insights
 ❓: What distinguishes genuine understanding from sophisticated pattern matching in AI systems?"""
 
-def load_example2(b):
-    message_widget.value = """🧠: Human
+    def load_example2(b):
+        message_widget.value = """🧠: Human
 🚀: design_category_theory_library
 💡: create_mathematical_computing_toolkit
 🎯: software_development_project
 📦: python_library_with_documentation
 ⏰: 8_weeks_development_timeline"""
 
-def load_example3(b):
-    message_widget.value = """🧠: Human
+    def load_example3(b):
+        message_widget.value = """🧠: Human
 🔍: analyze_human_AI_collaboration_patterns
 💡: understanding_effective_partnership_dynamics
 🎯: research_investigation
 📦: structured_findings_and_recommendations"""
 
-example1.on_click(load_example1)
-example2.on_click(load_example2)
-example3.on_click(load_example3)
-
-example_box = widgets.HBox([example1, example2, example3])
-display(example_box)
-
-# Export functionality
-print("\n💾 Export Conversation")
-export_button = widgets.Button(description="📄 Export as JSON", button_style='success')
-export_output = widgets.Output()
-
-def export_conversation(b):
-    with export_output:
-        clear_output()
-        if hyri.conversation_history:
-            json_data = hyri.export_conversation()
-            print("📄 Conversation Export:")
-            print("=" * 40)
-            print(json_data)
-        else:
-            print("No conversation to export yet.")
+    example1.on_click(load_example1)
+    example2.on_click(load_example2)
+    example3.on_click(load_example3)
+
+    example_box = widgets.HBox([example1, example2, example3])
+
+    export_button = widgets.Button(description="📄 Export as JSON", button_style='success')
+    export_output = widgets.Output()
+
+    def export_conversation(b):
+        with export_output:
+            clear_output()
+            if hyri.conversation_history:
+                json_data = hyri.export_conversation()
+                print("📄 Conversation Export:")
+                print("=" * 40)
+                print(json_data)
+            else:
+                print("No conversation to export yet.")
+
+    export_button.on_click(export_conversation)
+
+    return {
+        'setup': (openai_key_widget, anthropic_key_widget, setup_button, setup_output),
+        'chat': (message_widget, button_box, chat_output),
+        'examples': (example_box,),
+        'export': (export_button, export_output),
+    }
+
+def build_ui():
+    """Display the HyRI interface; safe to call repeatedly"""
+    global _ui
+    if _ui is None:
+        _ui = _make_ui()
+
+    print("\n🔧 Setup")
+    print("Enter your API keys below (at least one required):")
+    display(*_ui['setup'])
+
+    print("\n💬 Conversation Interface")
+    print("Use NeuroGlyph tokens in your messages:")
+    display(HTML(_CHAT_CSS))  # shared message styles, emitted once
+    display(*_ui['chat'])
+
+    print("\n📖 NeuroGlyph Token Reference:")
+    print("🧠 /mind: Participants    💡 /intent: Purpose")
+    print("📚 /focus: Topic          📦 /deliverable: Output")
+    print("🎯 /context: Situation    ❓ /query: Question")
+    print("🚀 /act: Action           ⏰ /timeline: Time")
+    print("🔥 /pulse: Priority       🤝 /trust: Trust level")
+
+    print("\n✨ Example Templates:")
+    display(*_ui['examples'])
+
+    # Export functionality
+    print("\n💾 Export Conversation")
+    display(*_ui['export'])
 
-export_button.on_click(export_conversation)
-display(export_button, export_output)
+build_ui()
 
 print("\n🎯 Instructions:")
 print("1. Set your API keys above")
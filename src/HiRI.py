@@ -8,14 +8,40 @@ Supports text and voice input, protocol validation, and conversation archiving.
 """
 
 import asyncio
+import atexit
+import functools
 import json
-import re
+import shutil
+import sys
 import datetime
+
+try:
+    # Optional: the third-party `regex` module compiles to a faster engine
+    # than stdlib `re` for alternation-heavy patterns like the tokenizer.
+    import regex as re
+except ImportError:
+    import re
+
+try:
+    # Optional: C-accelerated JSON for conversation archiving
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: HTTP/2 for the pooled API client (install httpx[http2]);
+    # without the h2 package httpx falls back to HTTP/1.1 keep-alive
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+from collections import deque
 from typing import Dict, List, Optional, Union, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import speech_recognition as sr
 import pyttsx3
+import httpx
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
 import yaml
@@ -25,12 +51,16 @@ class AgentType(Enum):
     GPT = "gpt"
     CLAUDE = "claude"
 
-@dataclass
+@dataclass(slots=True)
 class NeuroGlyphMessage:
-    """Represents a parsed NeuroGlyph message"""
+    """Represents a parsed NeuroGlyph message.
+
+    agent_type holds the AgentType *value* (a plain string) so instances
+    stay slot-packed and serialize to JSON without enum handling.
+    """
     timestamp: str
     agent: str
-    agent_type: AgentType
+    agent_type: str
     tokens: Dict[str, Any]
     raw_text: str
     is_valid: bool = True
@@ -40,11 +70,49 @@ class NeuroGlyphMessage:
         if self.validation_errors is None:
             self.validation_errors = []
 
+# Short field keys keep archive lines compact; _MSG_FIELDS maps them back
+# to dataclass field names on load.
+_MSG_FIELDS = {
+    't': 'timestamp', 'a': 'agent', 'y': 'agent_type',
+    'k': 'tokens', 'r': 'raw_text', 'v': 'is_valid', 'e': 'validation_errors',
+}
+
+def _msg_to_dict(msg: NeuroGlyphMessage) -> Dict[str, Any]:
+    """Serialize a message directly, avoiding dataclasses.asdict recursion"""
+    return {
+        't': msg.timestamp,
+        'a': msg.agent,
+        'y': msg.agent_type,
+        'k': msg.tokens,
+        'r': msg.raw_text,
+        'v': msg.is_valid,
+        'e': msg.validation_errors,
+    }
+
+def _msg_from_dict(data: Dict[str, Any]) -> NeuroGlyphMessage:
+    """Rebuild a message from its serialized (compact or legacy) form"""
+    if 'raw_text' in data:
+        # Archive written with full field names
+        return NeuroGlyphMessage(**data)
+    return NeuroGlyphMessage(**{full: data[short] for short, full in _MSG_FIELDS.items()})
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class NeuroGlyphParser:
     """Parses and validates NeuroGlyph protocol messages"""
     
-    # Core NeuroGlyph tokens mapping
-    CORE_TOKENS = {
+    # Core NeuroGlyph tokens mapping. The slash tokens are interned so the
+    # membership tests and dict lookups on every parse short-circuit on
+    # pointer equality.
+    CORE_TOKENS = {_emoji: sys.intern(_slash) for _emoji, _slash in {
         # Core tokens
         '🚀': '/act', '📚': '/focus', '🧠': '/mind', '🎯': '/context',
         '💡': '/intent', '📦': '/deliverable', '⏰': '/timeline', 
@@ -55,41 +123,55 @@ class NeuroGlyphParser:
         
         # Extended tokens
         '🏛️': '/govern', '📋': '/norm', '💰': '/resource', '🤝': '/trust',
-        '🎯': '/goal', '⚡': '/trigger', '🎨': '/palette', '👤': '/character',
+        '⚡': '/trigger', '🎨': '/palette', '👤': '/character',
         '🌍': '/setting', '📖': '/lore', '🎲': '/turn', '🌱': '/seed',
         '🎵': '/motif', '🏗️': '/structure', '👁️': '/pov', '✨': '/flourish',
         
         # Research & meta tokens
-        '❓': '/query', '🔄': '/ongoing', '🌉': '/bridge', '⚖️': '/dialectic',
-        '🧠🧠': '/meta', '📄': '/source', '🔄': '/transform', '🔍': '/introspect'
-    }
-    
-    # Reverse mapping for emoji to slash conversion
-    SLASH_TO_EMOJI = {v: k for k, v in CORE_TOKENS.items()}
-    
-    def __init__(self):
-        self.token_pattern = re.compile(r'([🚀📚🧠🎯💡📦⏰🔥🏔️🔗🌐🔄🔍🎛️⛓️📢🔧📝📊📡👥🎭🏛️📋💰🤝⚡🎨👤🌍📖🎲🌱🎵🏗️👁️✨❓🌉⚖️📄]|/\w+):\s*(.+?)(?=\n[🚀📚🧠🎯💡📦⏰🔥🏔️🔗🌐🔄🔍🎛️⛓️📢🔧📝📊📡👥🎭🏛️📋💰🤝⚡🎨👤🌍📖🎲🌱🎵🏗️👁️✨❓🌉⚖️📄]|/\w+:|$)', re.DOTALL | re.MULTILINE)
-    
+        '❓': '/query', '🌉': '/bridge', '⚖️': '/dialectic',
+        '🧠🧠': '/meta', '📄': '/source'
+    }.items()}
+
+    # Reverse mapping for emoji to slash conversion, with explicit
+    # first-declared precedence should an emoji ever be re-mapped
+    SLASH_TO_EMOJI: Dict[str, str] = {}
+    for _emoji, _slash in CORE_TOKENS.items():
+        SLASH_TO_EMOJI.setdefault(_slash, _emoji)
+    del _emoji, _slash
+
     def parse_message(self, text: str, agent: str, agent_type: AgentType) -> NeuroGlyphMessage:
         """Parse a NeuroGlyph message and extract tokens"""
         tokens = {}
         validation_errors = []
-        
-        # Extract tokens using regex
-        matches = self.token_pattern.findall(text)
-        
-        for token_raw, value in matches:
-            # Convert emoji to slash notation if needed
-            token = self.CORE_TOKENS.get(token_raw, token_raw)
-            tokens[token] = value.strip()
-        
+
+        # Single-pass line scan: NeuroGlyph messages are line-oriented
+        # (one "token: value" per line), so a splitlines/partition walk
+        # replaces the regex engine on the hot path. Multi-line values
+        # accumulate until the next recognized token prefix.
+        current_token = None
+        value_lines = []
+        for line in text.splitlines():
+            head, sep, rest = line.partition(':')
+            head = head.strip()
+            if sep and (head in _VALID_PREFIXES or _SLASH_TOKEN_RE.fullmatch(head)):
+                if current_token is not None:
+                    tokens[current_token] = '\n'.join(value_lines).strip()
+                # Convert emoji to slash notation if needed; unknown slash
+                # commands get interned so later lookups stay pointer-fast
+                current_token = self.CORE_TOKENS.get(head) or sys.intern(head)
+                value_lines = [rest]
+            elif current_token is not None:
+                value_lines.append(line)
+        if current_token is not None:
+            tokens[current_token] = '\n'.join(value_lines).strip()
+
         # Validation
         is_valid = self.validate_message(tokens, validation_errors)
         
         return NeuroGlyphMessage(
             timestamp=datetime.datetime.now().isoformat(),
             agent=agent,
-            agent_type=agent_type,
+            agent_type=agent_type.value,
             tokens=tokens,
             raw_text=text,
             is_valid=is_valid,
@@ -110,7 +192,7 @@ class NeuroGlyphParser:
                 is_valid = False
         
         # Check for deliverable expectations
-        if any(token in tokens for token in ['/act', '/query', '/resolve']):
+        if any(token in tokens for token in _INTERACTIVE_TOKENS):
             if '/deliverable' not in tokens:
                 errors.append("Interactive tokens should specify expected /deliverable")
         
@@ -118,33 +200,105 @@ class NeuroGlyphParser:
     
     def format_message(self, tokens: Dict[str, Any], use_emojis: bool = True) -> str:
         """Format tokens back into NeuroGlyph message"""
-        lines = []
-        for token, value in tokens.items():
-            if use_emojis and token in self.SLASH_TO_EMOJI:
-                display_token = self.SLASH_TO_EMOJI[token]
-            else:
-                display_token = token
-            lines.append(f"{display_token}: {value}")
-        return "\n".join(lines)
+        emoji_map = self.SLASH_TO_EMOJI if use_emojis else {}
+        return "\n".join(f"{emoji_map.get(token, token)}: {value}"
+                         for token, value in tokens.items())
+
+# Token prefixes recognized by the line scanner, built once at import time
+# from the (deduplicated) CORE_TOKENS table so the tokenizer stays in sync
+# with it. Unknown slash commands still parse via _SLASH_TOKEN_RE, a plain
+# anchored match with no backtracking potential — parsing stays linear even
+# on pathological input. Because prefixes are compared as whole strings,
+# multi-codepoint tokens such as 🧠🧠 (/meta) match correctly, which a
+# single-character regex class never could.
+_VALID_PREFIXES = frozenset(NeuroGlyphParser.CORE_TOKENS) | frozenset(NeuroGlyphParser.CORE_TOKENS.values())
+_SLASH_TOKEN_RE = re.compile(r'/\w+')
+
+# Tokens that expect a /deliverable in response
+_INTERACTIVE_TOKENS = frozenset(map(sys.intern, ('/act', '/query', '/resolve')))
+
+# Tokens projected into the LLM prompt for each recent message; falling
+# back to (capped) raw text only when none are present keeps prompt size
+# and per-turn token cost down.
+_CONTEXT_KEYS = ('/focus', '/intent', '/deliverable', '/query')
+
+def _context_line(msg: NeuroGlyphMessage) -> str:
+    """Render one recent message as a compact token-only prompt line"""
+    projection = " ".join(f"{key}={msg.tokens[key]}"
+                          for key in _CONTEXT_KEYS if key in msg.tokens)
+    return f"[{msg.agent}] " + (projection or msg.raw_text[:200])
+
+# Meta tokens skipped when speaking a message aloud
+_TTS_SKIP = frozenset({'/mind', '/context', '/intent', '/deliverable',
+                       '/timeline', '/channel', '/norm', '/govern'})
+
+def _speech_parts(text: str):
+    """Yield the speakable pieces of a NeuroGlyph message"""
+    for line in text.split('\n'):
+        head, sep, value = line.partition(':')
+        if sep:
+            # Skip meta tokens, speak main content
+            if head.strip() not in _TTS_SKIP:
+                yield value.strip()
+        else:
+            yield line
+
+# Fixed instruction block appended to every agent prompt; hoisted so it is
+# not rebuilt per call.
+_CONTEXT_FOOTER = (
+    "",
+    "Please respond using NeuroGlyph protocol. Include appropriate tokens like:",
+    "/mind: your_agent_name",
+    "/focus: main_topic_or_concept",
+    "/intent: your_purpose_in_responding",
+    "/deliverable: what_you_aim_to_provide",
+    "And your actual response content.",
+    "",
+    "Be conversational but maintain the structured format."
+)
 
 class ConversationEngine:
     """Manages multi-agent NeuroGlyph conversations"""
     
     def __init__(self, openai_key: str, anthropic_key: str):
-        self.openai_client = AsyncOpenAI(api_key=openai_key)
-        self.anthropic_client = AsyncAnthropic(api_key=anthropic_key)
+        # One pooled HTTP client shared by both SDKs: keep-alive amortizes
+        # TLS handshakes across turns and HTTP/2 (when h2 is installed)
+        # multiplexes the concurrently fired GPT+Claude calls.
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(30, connect=5),
+            http2=_HTTP2_AVAILABLE
+        )
+        self.openai_client = AsyncOpenAI(api_key=openai_key, http_client=self._http_client)
+        self.anthropic_client = AsyncAnthropic(api_key=anthropic_key, http_client=self._http_client)
         self.parser = NeuroGlyphParser()
         self.conversation_history: List[NeuroGlyphMessage] = []
         self.active_context = {}
-        
-        # Voice setup
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.tts_engine = pyttsx3.init()
-        
-        # Adjust recognition settings
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source)
+
+        # History memory: older turns get compressed into a rolling summary
+        # so prompt context stays bounded as the conversation grows.
+        self.summary: str = ""
+        self.recent_window: deque = deque(maxlen=10)
+
+        # Append-only session log: each message is written once as it
+        # arrives, so saving never rewrites stable history and a crash
+        # loses at most the buffered tail.
+        self.session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._log_path = f"ng_session_{self.session_id}.jsonl"
+        self._log = open(self._log_path, 'ab', buffering=64 * 1024)
+        atexit.register(self.close)
+
+        # Context string cache, invalidated whenever history or the active
+        # context changes (e.g. both agents of one turn reuse one build).
+        self._ctx_cache: Optional[str] = None
+        self._ctx_dirty = True
+
+        # Voice state; the audio stack itself (recognizer, microphone,
+        # TTS engine, background listener) initializes lazily on first
+        # voice use so text-only sessions skip its startup cost entirely.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._utterance_queue: asyncio.Queue = asyncio.Queue()
+        self._stop_listening = None
     
     async def initialize_conversation(self, topic: str, participants: List[str], 
                                     context: str = "", intent: str = "") -> NeuroGlyphMessage:
@@ -165,45 +319,62 @@ class ConversationEngine:
         init_message = NeuroGlyphMessage(
             timestamp=datetime.datetime.now().isoformat(),
             agent="system",
-            agent_type=AgentType.HUMAN,  # System as human-initiated
+            agent_type=AgentType.HUMAN.value,  # System as human-initiated
             tokens=init_tokens,
             raw_text=self.parser.format_message(init_tokens)
         )
         
-        self.conversation_history.append(init_message)
+        self._append_message(init_message)
         self.active_context = init_tokens.copy()
-        
+
         return init_message
+
+    def _append_message(self, message: NeuroGlyphMessage):
+        """Record a message in history, the recent window and the session log"""
+        self.conversation_history.append(message)
+        self.recent_window.append(message)
+        self._log.write(_json_dumps(_msg_to_dict(message)) + b'\n')
+        self._ctx_dirty = True
     
+    def _summarize_batch(self, messages: List[NeuroGlyphMessage]) -> str:
+        """Compress a batch of older messages into a short NeuroGlyph summary block"""
+        parts = []
+        for msg in messages:
+            highlights = [msg.tokens[key] for key in ('/focus', '/intent', '/deliverable')
+                          if key in msg.tokens]
+            if highlights:
+                parts.append(f"[{msg.agent}] " + " | ".join(highlights))
+        return "\n".join(parts)
+
     def get_conversation_context(self) -> str:
-        """Build context string for AI agents"""
+        """Build context string for AI agents (cached until history changes)"""
+        if not self._ctx_dirty and self._ctx_cache is not None:
+            return self._ctx_cache
+
         context_parts = [
             "You are participating in a NeuroGlyph conversation. ",
             "NeuroGlyph is a structured protocol for human-AI dialogue.",
             f"Active context: {self.active_context.get('/context', 'General dialogue')}",
             f"Current focus: {self.active_context.get('/focus', 'Open discussion')}",
             f"Participants: {self.active_context.get('/mind', 'Unknown')}",
-            "",
-            "Recent conversation history:"
+            ""
         ]
-        
-        # Add last 3 messages for context
-        for msg in self.conversation_history[-3:]:
-            context_parts.append(f"[{msg.agent}]: {msg.raw_text}")
-        
-        context_parts.extend([
-            "",
-            "Please respond using NeuroGlyph protocol. Include appropriate tokens like:",
-            "/mind: your_agent_name",
-            "/focus: main_topic_or_concept", 
-            "/intent: your_purpose_in_responding",
-            "/deliverable: what_you_aim_to_provide",
-            "And your actual response content.",
-            "",
-            "Be conversational but maintain the structured format."
-        ])
-        
-        return "\n".join(context_parts)
+
+        if self.summary:
+            context_parts.append("Summary of earlier conversation:")
+            context_parts.append(self.summary)
+            context_parts.append("")
+
+        context_parts.append("Recent conversation history:")
+
+        # Only the bounded recent window goes into the prompt, projected
+        # down to its salient tokens
+        context_parts.extend(_context_line(msg) for msg in self.recent_window)
+        context_parts.extend(_CONTEXT_FOOTER)
+
+        self._ctx_cache = "\n".join(context_parts)
+        self._ctx_dirty = False
+        return self._ctx_cache
     
     async def get_gpt_response(self, prompt: str) -> str:
         """Get response from GPT using NeuroGlyph context"""
@@ -238,44 +409,70 @@ class ConversationEngine:
         except Exception as e:
             return f"Claude Error: {str(e)}"
     
-    def listen_for_speech(self) -> Optional[str]:
-        """Capture speech input from microphone"""
+    @functools.cached_property
+    def recognizer(self):
+        """Speech recognizer, constructed on first voice use"""
+        return sr.Recognizer()
+
+    @functools.cached_property
+    def microphone(self):
+        """Microphone, calibrated for ambient noise on first voice use"""
+        microphone = sr.Microphone()
+        with microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source)
+        return microphone
+
+    @functools.cached_property
+    def tts_engine(self):
+        """Text-to-speech engine, constructed on first spoken reply"""
+        return pyttsx3.init()
+
+    def _on_utterance(self, recognizer, audio):
+        """Background-thread callback: transcribe and enqueue an utterance"""
         try:
-            print("🎤 Listening... (speak now)")
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=30)
-            
-            print("🔄 Processing speech...")
-            text = self.recognizer.recognize_google(audio)
-            return text
-        except sr.WaitTimeoutError:
-            print("⏰ No speech detected")
-            return None
+            text = recognizer.recognize_google(audio)
         except sr.UnknownValueError:
             print("❌ Could not understand audio")
-            return None
+            return
         except sr.RequestError as e:
             print(f"❌ Speech recognition error: {e}")
+            return
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._utterance_queue.put_nowait, text)
+
+    async def listen_for_speech(self) -> Optional[str]:
+        """Await the next transcribed utterance from the background listener"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if self._stop_listening is None:
+            # First voice use: spin up the background listener. Audio
+            # capture and transcription then overlap with TTS/LLM work.
+            self._stop_listening = self.recognizer.listen_in_background(
+                self.microphone, self._on_utterance)
+
+        print("🎤 Listening... (speak now)")
+        try:
+            return await asyncio.wait_for(self._utterance_queue.get(), timeout=30)
+        except asyncio.TimeoutError:
+            print("⏰ No speech detected")
             return None
     
     def speak_text(self, text: str):
         """Convert text to speech"""
+        self.speak_texts([text])
+
+    def speak_texts(self, texts: List[str]):
+        """Speak several messages with a single TTS run"""
         try:
-            # Extract main content from NG message for speaking
-            content_parts = []
-            for line in text.split('\n'):
-                if ':' in line:
-                    token, value = line.split(':', 1)
-                    # Skip meta tokens, speak main content
-                    if token.strip() not in ['/mind', '/context', '/intent', '/deliverable', 
-                                           '/timeline', '/channel', '/norm', '/govern']:
-                        content_parts.append(value.strip())
-                else:
-                    content_parts.append(line)
-            
-            speech_text = ' '.join(content_parts).strip()
-            if speech_text:
-                self.tts_engine.say(speech_text)
+            queued = False
+            for text in texts:
+                # Extract main content from NG message for speaking
+                speech_text = ' '.join(_speech_parts(text)).strip()
+                if speech_text:
+                    self.tts_engine.say(speech_text)
+                    queued = True
+            if queued:
                 self.tts_engine.runAndWait()
         except Exception as e:
             print(f"TTS Error: {e}")
@@ -283,8 +480,15 @@ class ConversationEngine:
     async def add_message(self, text: str, agent: str, agent_type: AgentType) -> NeuroGlyphMessage:
         """Add a message to the conversation"""
         message = self.parser.parse_message(text, agent, agent_type)
-        self.conversation_history.append(message)
-        
+        self._append_message(message)
+
+        # Every 10 turns, fold the batch that just left the recent window
+        # into the rolling summary
+        if len(self.conversation_history) % 10 == 0:
+            batch_summary = self._summarize_batch(self.conversation_history[-20:-10])
+            if batch_summary:
+                self.summary = f"{self.summary}\n{batch_summary}".strip()
+
         # Update active context with new information
         if '/context' in message.tokens:
             self.active_context['/context'] = message.tokens['/context']
@@ -305,27 +509,74 @@ class ConversationEngine:
             raise ValueError(f"Invalid agent type for processing: {agent_type}")
         
         return await self.add_message(response, agent_name, agent_type)
-    
+
+    async def process_agents_concurrently(self, agent_types: List[AgentType],
+                                          prompt: str = "") -> List[NeuroGlyphMessage]:
+        """Run several AI agent turns concurrently with asyncio.gather.
+
+        The provider calls go out in parallel; history appends stay
+        sequential afterwards so conversation order is deterministic.
+        """
+        responders = {
+            AgentType.GPT: ("GPT-4", self.get_gpt_response),
+            AgentType.CLAUDE: ("Claude", self.get_claude_response),
+        }
+        for agent_type in agent_types:
+            if agent_type not in responders:
+                raise ValueError(f"Invalid agent type for processing: {agent_type}")
+
+        responses = await asyncio.gather(
+            *(responders[agent_type][1](prompt) for agent_type in agent_types),
+            return_exceptions=True
+        )
+
+        messages = []
+        for agent_type, response in zip(agent_types, responses):
+            agent_name = responders[agent_type][0]
+            if isinstance(response, Exception):
+                response = f"{agent_name} Error: {response}"
+            messages.append(await self.add_message(response, agent_name, agent_type))
+        return messages
+
     def save_conversation(self, filename: str):
-        """Save conversation history to file"""
-        data = {
-            'conversation_id': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+        """Snapshot the append-only session log to a named JSON Lines archive"""
+        self._log.flush()
+
+        header = {
+            'conversation_id': self.session_id,
             'active_context': self.active_context,
-            'messages': [asdict(msg) for msg in self.conversation_history]
         }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    
+
+        with open(filename, 'wb') as f:
+            f.write(_json_dumps(header))
+            f.write(b'\n')
+            with open(self._log_path, 'rb') as log:
+                shutil.copyfileobj(log, f)
+
+    def close(self):
+        """Stop the background listener and close the session log"""
+        if self._stop_listening is not None:
+            self._stop_listening(wait_for_stop=False)
+            self._stop_listening = None
+        if not self._log.closed:
+            self._log.flush()
+            self._log.close()
+
+    async def aclose(self):
+        """Release the shared HTTP connection pool and the session log"""
+        await self._http_client.aclose()
+        self.close()
+
     def load_conversation(self, filename: str):
-        """Load conversation history from file"""
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.active_context = data['active_context']
-        self.conversation_history = [
-            NeuroGlyphMessage(**msg_data) for msg_data in data['messages']
-        ]
+        """Load conversation history from a JSON Lines file"""
+        with open(filename, 'rb') as f:
+            header = _json_loads(f.readline())
+            messages = [_msg_from_dict(_json_loads(line)) for line in f if line.strip()]
+
+        self.active_context = header['active_context']
+        self.conversation_history = messages
+        self.recent_window = deque(messages, maxlen=self.recent_window.maxlen)
+        self._ctx_dirty = True
 
 class NeuroGlyphPlatform:
     """Main platform interface for NeuroGlyph conversations"""
@@ -393,12 +644,12 @@ class NeuroGlyphPlatform:
             try:
                 # Get human input
                 if input_mode == "voice":
-                    user_input = self.engine.listen_for_speech()
+                    user_input = await self.engine.listen_for_speech()
                     if user_input is None:
                         continue
                     print(f"🗣️ You said: {user_input}")
                 else:
-                    user_input = input("\n💬 Your message (or command): ").strip()
+                    user_input = (await asyncio.to_thread(input, "\n💬 Your message (or command): ")).strip()
                 
                 if not user_input:
                     continue
@@ -415,25 +666,27 @@ class NeuroGlyphPlatform:
                     print("⌨️ Switched to text input")
                     continue
                 elif user_input.lower() == 'save':
-                    filename = f"ng_conversation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                    filename = f"ng_conversation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
                     self.engine.save_conversation(filename)
                     print(f"💾 Conversation saved to {filename}")
                     continue
                 elif user_input.lower() in ['gpt', 'claude', 'both']:
                     # Direct AI response request
-                    if user_input.lower() in ['gpt', 'both']:
+                    if user_input.lower() == 'both':
+                        print("\n🤖 Both agents responding...")
+                        messages = await self.engine.process_agents_concurrently(
+                            [AgentType.GPT, AgentType.CLAUDE])
+                    elif user_input.lower() == 'gpt':
                         print("\n🤖 GPT-4 responding...")
-                        gpt_msg = await self.engine.process_agent_turn(AgentType.GPT)
-                        print(f"[GPT-4]: {gpt_msg.raw_text}")
-                        if self.config.get('voice_enabled') and input_mode == "voice":
-                            self.engine.speak_text(gpt_msg.raw_text)
-                    
-                    if user_input.lower() in ['claude', 'both']:
+                        messages = [await self.engine.process_agent_turn(AgentType.GPT)]
+                    else:
                         print("\n🎭 Claude responding...")
-                        claude_msg = await self.engine.process_agent_turn(AgentType.CLAUDE)
-                        print(f"[Claude]: {claude_msg.raw_text}")
+                        messages = [await self.engine.process_agent_turn(AgentType.CLAUDE)]
+
+                    for msg in messages:
+                        print(f"[{msg.agent}]: {msg.raw_text}")
                         if self.config.get('voice_enabled') and input_mode == "voice":
-                            self.engine.speak_text(claude_msg.raw_text)
+                            await asyncio.to_thread(self.engine.speak_text, msg.raw_text)
                     continue
                 
                 # Process as regular NeuroGlyph message
@@ -448,16 +701,15 @@ class NeuroGlyphPlatform:
                 # Auto-respond with AI agents if requested
                 if '/echo' in human_msg.tokens or '/query' in human_msg.tokens:
                     print("\n🤖 Auto-responding with AI agents...")
-                    
-                    gpt_msg = await self.engine.process_agent_turn(AgentType.GPT, user_input)
-                    print(f"\n[GPT-4]: {gpt_msg.raw_text}")
-                    
-                    claude_msg = await self.engine.process_agent_turn(AgentType.CLAUDE, user_input)
-                    print(f"\n[Claude]: {claude_msg.raw_text}")
-                    
+
+                    messages = await self.engine.process_agents_concurrently(
+                        [AgentType.GPT, AgentType.CLAUDE], user_input)
+                    for msg in messages:
+                        print(f"\n[{msg.agent}]: {msg.raw_text}")
+
                     if self.config.get('voice_enabled') and input_mode == "voice":
-                        self.engine.speak_text(gpt_msg.raw_text)
-                        self.engine.speak_text(claude_msg.raw_text)
+                        await asyncio.to_thread(
+                            self.engine.speak_texts, [msg.raw_text for msg in messages])
             
             except KeyboardInterrupt:
                 print("\n\n👋 Conversation interrupted by user")
@@ -468,10 +720,12 @@ class NeuroGlyphPlatform:
         
         # Auto-save if enabled
         if self.config.get('auto_save', True):
-            filename = f"ng_conversation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"ng_conversation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
             self.engine.save_conversation(filename)
             print(f"💾 Conversation auto-saved to {filename}")
 
+        await self.engine.aclose()
+
 async def main():
     """Main entry point"""
     platform = NeuroGlyphPlatform()
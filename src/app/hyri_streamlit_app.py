@@ -9,16 +9,40 @@ enabling structured dialogue between humans and AI agents using NeuroGlyph proto
 
 import streamlit as st
 import asyncio
+import collections
+import functools
+import hashlib
 import json
-import datetime
 import re
+import time
+import datetime
+
+try:
+    # Optional: C multi-pattern scanner; token extraction becomes one
+    # linear pass instead of an alternation-regex search
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Optional: C-accelerated JSON for conversation export
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _dump_line(obj) -> str:
+        return orjson.dumps(obj).decode() + '\n'
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def _dump_line(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False) + '\n'
+
 from typing import Dict, List, Optional, Union, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
-import openai
-import anthropic
-import pandas as pd
-from io import StringIO
 
 # Set page config
 st.set_page_config(
@@ -36,66 +60,213 @@ class AgentType(Enum):
 @dataclass
 class NeuroGlyphMessage:
     """Represents a parsed NeuroGlyph message"""
-    timestamp: str
+    # Captured as an integer nanosecond stamp; the ISO string is built
+    # lazily via the timestamp property when display/export needs it
+    timestamp_ns: int
     agent: str
     agent_type: AgentType
     tokens: Dict[str, Any]
     raw_text: str
     is_valid: bool = True
     validation_errors: List[str] = None
+    # (display_token, value) pairs resolved once at construction; tokens
+    # are immutable afterwards, so renders never repeat the emoji lookup
+    rendered_tokens: Optional[List[tuple]] = None
 
     def __post_init__(self):
         if self.validation_errors is None:
             self.validation_errors = []
+        if self.rendered_tokens is None:
+            emoji_map = NeuroGlyphParser.SLASH_TO_EMOJI
+            self.rendered_tokens = [(emoji_map.get(token, token), value)
+                                    for token, value in self.tokens.items()]
+        self._cached_dict = None
+        self._timestamp_iso = None
+
+    @property
+    def timestamp(self) -> str:
+        """ISO-format timestamp, built on first access"""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = datetime.datetime.fromtimestamp(
+                self.timestamp_ns / 1e9
+            ).isoformat()
+        return self._timestamp_iso
+
+    def _to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form for export; no asdict deep-copy recursion and
+        the enum is flattened to its JSON-safe value"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                'timestamp': self.timestamp,
+                'agent': self.agent,
+                'agent_type': self.agent_type.value,
+                'tokens': self.tokens,
+                'raw_text': self.raw_text,
+                'is_valid': self.is_valid,
+                'validation_errors': self.validation_errors
+            }
+        return self._cached_dict
+
+# U+FE0F variation selectors make visually identical emoji compare unequal
+# (🏔️ pasted from a chat client vs. 🏔 typed bare); both message text and
+# the token table are stripped through this so lookups always hit
+_VS_STRIP = str.maketrans('', '', '\ufe0f')
 
 class NeuroGlyphParser:
     """Parses and validates NeuroGlyph protocol messages"""
-    
-    # Core NeuroGlyph tokens mapping
-    CORE_TOKENS = {
+
+    # Core NeuroGlyph tokens mapping; each emoji appears exactly once so
+    # parsing is deterministic and the reverse map below stays correct
+    CORE_TOKENS = {_k.translate(_VS_STRIP): _v for _k, _v in {
         # Core tokens
         '🚀': '/act', '📚': '/focus', '🧠': '/mind', '🎯': '/context',
-        '💡': '/intent', '📦': '/deliverable', '⏰': '/timeline', 
+        '💡': '/intent', '📦': '/deliverable', '⏰': '/timeline',
         '🔥': '/pulse', '🏔️': '/gliph', '🔗': '/relation', '🌐': '/network',
-        '🔄': '/compose', '🔍': '/zoom', '🎛️': '/switch_context', 
+        '🔄': '/compose', '🔍': '/zoom', '🎛️': '/switch_context',
         '⛓️': '/chain', '📢': '/echo', '🔧': '/resolve', '📝': '/note',
         '📊': '/metric', '📡': '/channel', '👥': '/collective', '🎭': '/role',
-        
+
         # Extended tokens
         '🏛️': '/govern', '📋': '/norm', '💰': '/resource', '🤝': '/trust',
-        '🎯': '/goal', '⚡': '/trigger', '🎨': '/palette', '👤': '/character',
+        '⚡': '/trigger', '🎨': '/palette', '👤': '/character',
         '🌍': '/setting', '📖': '/lore', '🎲': '/turn', '🌱': '/seed',
         '🎵': '/motif', '🏗️': '/structure', '👁️': '/pov', '✨': '/flourish',
-        
+
         # Research & meta tokens
-        '❓': '/query', '🔄': '/ongoing', '🌉': '/bridge', '⚖️': '/dialectic',
-        '🧠🧠': '/meta', '📄': '/source', '🔄': '/transform', '🔍': '/introspect'
+        '❓': '/query', '🌉': '/bridge', '⚖️': '/dialectic',
+        '🧠🧠': '/meta', '📄': '/source'
+    }.items()}
+
+    # Alternate slash forms that share an emoji with a canonical token
+    # above; kept separate so CORE_TOKENS has no duplicate keys silently
+    # overwriting each other
+    ALIAS_TOKENS = {
+        '/goal': '🎯',
+        '/ongoing': '🔄', '/transform': '🔄',
+        '/introspect': '🔍'
     }
-    
-    # Reverse mapping for emoji to slash conversion
+
+    # Reverse mapping for emoji to slash conversion (aliases included so
+    # they still format back to their shared emoji)
     SLASH_TO_EMOJI = {v: k for k, v in CORE_TOKENS.items()}
-    
-    def __init__(self):
-        self.token_pattern = re.compile(r'([🚀📚🧠🎯💡📦⏰🔥🏔️🔗🌐🔄🔍🎛️⛓️📢🔧📝📊📡👥🎭🏛️📋💰🤝⚡🎨👤🌍📖🎲🌱🎵🏗️👁️✨❓🌉⚖️📄]|/\w+):\s*(.+?)(?=\n[🚀📚🧠🎯💡📦⏰🔥🏔️🔗🌐🔄🔍🎛️⛓️📢🔧📝📊📡👥🎭🏛️📋💰🤝⚡🎨👤🌍📖🎲🌱🎵🏗️👁️✨❓🌉⚖️📄]|/\w+:|$)', re.DOTALL | re.MULTILINE)
-    
+    SLASH_TO_EMOJI.update(ALIAS_TOKENS)
+
+    # One bit per validation-relevant token; parse_message accumulates a
+    # mask so validate_message is pure integer arithmetic
+    _ACT, _INTENT, _CONTEXT, _DELIVERABLE, _QUERY, _RESOLVE = (1 << _i for _i in range(6))
+    TOKEN_BIT = {
+        '/act': _ACT, '/intent': _INTENT, '/context': _CONTEXT,
+        '/deliverable': _DELIVERABLE, '/query': _QUERY, '/resolve': _RESOLVE
+    }
+
+    # Aho–Corasick automaton over all token literals, built once at import
+    # when pyahocorasick is installed (see module bottom); None means use
+    # the line-scanner path
+    TOKEN_AUTOMATON = None
+
+    # Unknown slash tokens (not in the automaton's fixed vocabulary) are
+    # picked up by this supplementary line-anchored pass
+    _SLASH_LINE_PATTERN = re.compile(r'(?m)^[ \t]*(/\w+):')
+
+    def _scan_lines(self, text: str) -> List[tuple]:
+        """Default path: scan line by line, no regex engine involved.
+
+        NeuroGlyph messages are line-oriented (`token: value` per line);
+        lines without a recognized token prefix continue the previous
+        value, which covers multi-line content.
+        """
+        matches = []
+        current_token = None
+        current_parts = []
+        for line in text.splitlines():
+            head, sep, value = line.partition(':')
+            head = head.strip()
+            token = None
+            if sep:
+                if head in self.CORE_TOKENS or head.startswith('/'):
+                    token = head
+
+            if token is not None:
+                if current_token is not None:
+                    joined = '\n'.join(current_parts).strip()
+                    if joined:
+                        matches.append((current_token, joined))
+                current_token = token
+                current_parts = [value]
+            elif current_token is not None:
+                current_parts.append(line)
+
+        if current_token is not None:
+            joined = '\n'.join(current_parts).strip()
+            if joined:
+                matches.append((current_token, joined))
+        return matches
+
+    def _scan_tokens(self, text: str) -> List[tuple]:
+        """Automaton fast path, producing the same tokens as _scan_lines"""
+        # Keep the longest literal per colon position (🧠 inside 🧠🧠)
+        hits = {}
+        for end, (slash, length) in self.TOKEN_AUTOMATON.iter(text):
+            colon = end + 1
+            if colon < len(text) and text[colon] == ':':
+                # Only accept tokens at line starts (indentation allowed),
+                # like the line-scanner path; a literal embedded mid-line
+                # in another token's value must not open a new token
+                start = end - length + 1
+                i = start - 1
+                while i >= 0 and text[i] in ' \t':
+                    i -= 1
+                if i >= 0 and text[i] != '\n':
+                    continue
+                prev = hits.get(colon)
+                if prev is None or length > prev[1]:
+                    hits[colon] = (slash, length, start)
+
+        # Slash tokens outside the automaton's vocabulary (the line
+        # scanner accepts any '/'-prefixed head) still start a token
+        for m in self._SLASH_LINE_PATTERN.finditer(text):
+            colon = m.end() - 1
+            if colon not in hits:
+                token = m.group(1)
+                hits[colon] = (token, len(token), m.start(1))
+
+        ordered = sorted(hits.items())
+        matches = []
+        for i, (colon, (slash, _length, _start)) in enumerate(ordered):
+            value_end = ordered[i + 1][1][2] if i + 1 < len(ordered) else len(text)
+            value = text[colon + 1:value_end].strip()
+            if value:
+                matches.append((slash, value))
+        return matches
+
     def parse_message(self, text: str, agent: str, agent_type: AgentType) -> NeuroGlyphMessage:
         """Parse a NeuroGlyph message and extract tokens"""
         tokens = {}
         validation_errors = []
+
+        # One linear pass dropping U+FE0F so pasted emoji variants match
+        # the normalized token table
+        text = text.translate(_VS_STRIP)
+
+        # Extract tokens: automaton scan when available, line scan otherwise
+        if self.TOKEN_AUTOMATON is not None:
+            matches = self._scan_tokens(text)
+        else:
+            matches = self._scan_lines(text)
         
-        # Extract tokens using regex
-        matches = self.token_pattern.findall(text)
-        
+        mask = 0
+        bit_get = self.TOKEN_BIT.get
         for token_raw, value in matches:
             # Convert emoji to slash notation if needed
             token = self.CORE_TOKENS.get(token_raw, token_raw)
             tokens[token] = value.strip()
-        
+            mask |= bit_get(token, 0)
+
         # Validation
-        is_valid = self.validate_message(tokens, validation_errors)
+        is_valid = self.validate_message(mask, validation_errors)
         
         return NeuroGlyphMessage(
-            timestamp=datetime.datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             agent=agent,
             agent_type=agent_type,
             tokens=tokens,
@@ -104,55 +275,142 @@ class NeuroGlyphParser:
             validation_errors=validation_errors
         )
     
-    def validate_message(self, tokens: Dict[str, Any], errors: List[str]) -> bool:
-        """Validate NeuroGlyph message structure"""
+    def validate_message(self, mask: int, errors: List[str]) -> bool:
+        """Validate NeuroGlyph message structure from the token bitmask"""
         is_valid = True
-        
+
         # Check required tokens for actions
-        if '/act' in tokens:
-            if '/intent' not in tokens:
+        if mask & self._ACT:
+            if not mask & self._INTENT:
                 errors.append("Action requires /intent declaration")
                 is_valid = False
-            if '/context' not in tokens:
+            if not mask & self._CONTEXT:
                 errors.append("Action requires /context declaration")
                 is_valid = False
-        
+
         # Check for deliverable expectations
-        if any(token in tokens for token in ['/act', '/query', '/resolve']):
-            if '/deliverable' not in tokens:
-                errors.append("Interactive tokens should specify expected /deliverable")
-        
+        if mask & (self._ACT | self._QUERY | self._RESOLVE) and not mask & self._DELIVERABLE:
+            errors.append("Interactive tokens should specify expected /deliverable")
+
         return is_valid
     
-    def format_message(self, tokens: Dict[str, Any], use_emojis: bool = True) -> str:
-        """Format tokens back into NeuroGlyph message"""
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _format_items(items: tuple, use_emojis: bool) -> str:
+        """Format a hashable items tuple; memoized because the template
+        buttons emit the same token sets over and over"""
+        emoji_map = NeuroGlyphParser.SLASH_TO_EMOJI
         lines = []
-        for token, value in tokens.items():
-            if use_emojis and token in self.SLASH_TO_EMOJI:
-                display_token = self.SLASH_TO_EMOJI[token]
+        for token, value in items:
+            if use_emojis and token in emoji_map:
+                display_token = emoji_map[token]
             else:
                 display_token = token
             lines.append(f"{display_token}: {value}")
         return "\n".join(lines)
 
+    def format_message(self, tokens: Dict[str, Any], use_emojis: bool = True) -> str:
+        """Format tokens back into NeuroGlyph message"""
+        return self._format_items(tuple(tokens.items()), use_emojis)
+
+if ahocorasick is not None:
+    _automaton = ahocorasick.Automaton()
+    for _emoji, _slash in NeuroGlyphParser.CORE_TOKENS.items():
+        _automaton.add_word(_emoji, (_slash, len(_emoji)))
+        _automaton.add_word(_slash, (_slash, len(_slash)))
+    for _slash in NeuroGlyphParser.ALIAS_TOKENS:
+        _automaton.add_word(_slash, (_slash, len(_slash)))
+    _automaton.make_automaton()
+    NeuroGlyphParser.TOKEN_AUTOMATON = _automaton
+
+# Stable system-prompt head, built once and kept byte-identical across
+# calls: Anthropic caches it via cache_control and OpenAI prefix-caches
+# identical prompt heads, so only the volatile tail is reprocessed
+STATIC_PREAMBLE = "\n".join([
+    "You are participating in a NeuroGlyph conversation through the HyRI platform.",
+    "NeuroGlyph is a structured protocol for human-AI dialogue.",
+    "Each line of a message is `token: value`. Token reference:",
+    *(f"{emoji} {slash}" for emoji, slash in NeuroGlyphParser.CORE_TOKENS.items()),
+    "",
+    "Please respond using NeuroGlyph protocol with appropriate tokens.",
+    "Be conversational but maintain the structured format.",
+    "Include meaningful content beyond just the protocol structure."
+])
+
 class HyRIEngine:
     """Core HyRI conversation engine for Streamlit"""
     
     def __init__(self):
         self.parser = NeuroGlyphParser()
-        self.conversation_history: List[NeuroGlyphMessage] = []
+        # Bounded recent window for rendering; the full session lives in
+        # the append-only JSONL log below
+        self.conversation_history = collections.deque(maxlen=200)
         self.active_context = {}
-        
-        # Initialize API clients
+
+        # Session log, opened lazily on the first message; exports stream
+        # already-encoded records from here instead of walking history
+        self._log_path = None
+        self._log = None
+
+        # Running analytics counters; Streamlit reruns read these in O(1)
+        # instead of rescanning the whole history
+        self.n_human = 0
+        self.n_ai = 0
+        self.n_invalid = 0
+
+        # Initialize API clients. The async pair lives only for the
+        # duration of one _both_async invocation: asyncio.run creates a
+        # fresh event loop per click, and httpx pools must not outlive
+        # the loop that opened their connections
         self.openai_client = None
         self.anthropic_client = None
+        self.openai_async = None
+        self.anthropic_async = None
+        self._openai_key = ""
+        self._anthropic_key = ""
+
+        # LRU of (model, context, prompt) -> response; repeated clicks on
+        # an unchanged prompt return instantly instead of re-billing
+        self._response_cache = collections.OrderedDict()
+
+        # Context string cache, keyed by a version bumped on every mutation;
+        # Streamlit reruns hit get_conversation_context many times between
+        # actual history changes
+        self._context_version = 0
+        self._context_cache = None
+
+    _RESPONSE_CACHE_SIZE = 256
+
+    @staticmethod
+    def _cache_key(model: str, context: str, prompt: str) -> bytes:
+        return hashlib.blake2b(
+            f"{model}\x00{context}\x00{prompt}".encode()
+        ).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return response
+
+    def _cache_put(self, key: bytes, response: str):
+        self._response_cache[key] = response
+        if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
     
     def initialize_clients(self, openai_key: str, anthropic_key: str):
         """Initialize API clients with provided keys"""
+        # SDK imports are deferred to here: they are only needed once keys
+        # are set, and keeping them out of module import shortens the
+        # cold-start of every new Streamlit session
         if openai_key:
+            import openai
             self.openai_client = openai.OpenAI(api_key=openai_key)
+            self._openai_key = openai_key
         if anthropic_key:
+            import anthropic
             self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
+            self._anthropic_key = anthropic_key
     
     def initialize_conversation(self, topic: str, participants: List[str], 
                               context: str = "", intent: str = "") -> NeuroGlyphMessage:
@@ -171,7 +429,7 @@ class HyRIEngine:
         }
         
         init_message = NeuroGlyphMessage(
-            timestamp=datetime.datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             agent="system",
             agent_type=AgentType.HUMAN,
             tokens=init_tokens,
@@ -180,50 +438,96 @@ class HyRIEngine:
         
         self.conversation_history.append(init_message)
         self.active_context = init_tokens.copy()
-        
+        self._context_version += 1
+        self._count_message(init_message)
+        self._log_message(init_message)
+
         return init_message
-    
-    def get_conversation_context(self) -> str:
-        """Build context string for AI agents"""
+
+    def _count_message(self, message: NeuroGlyphMessage):
+        """Update the running analytics counters for a new message"""
+        if message.agent_type == AgentType.HUMAN:
+            self.n_human += 1
+        else:
+            self.n_ai += 1
+        if not message.is_valid:
+            self.n_invalid += 1
+
+    def _log_message(self, message: NeuroGlyphMessage):
+        """Append one JSONL record to the session log"""
+        if self._log is None:
+            ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+            self._log_path = f"hyri_session_{ts}.jsonl"
+            self._log = open(self._log_path, 'a', buffering=1 << 16, encoding='utf-8')
+        self._log.write(_dump_line(message._to_dict()))
+
+    def export_json(self) -> str:
+        """Serialize the session, streaming message records from the log"""
+        if self._log is not None:
+            self._log.flush()
+            with open(self._log_path, encoding='utf-8') as f:
+                records = [line.rstrip('\n') for line in f if line.strip()]
+        else:
+            records = [_dump_line(msg._to_dict()).rstrip('\n')
+                       for msg in self.conversation_history]
+
+        head = _dumps({
+            'conversation_id': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+            'active_context': self.active_context
+        })
+        # Splice the already-encoded records in as the messages array
+        return (head[:-2] + ',\n  "messages": [\n    '
+                + ',\n    '.join(records) + '\n  ]\n}')
+
+    def _volatile_tail(self) -> str:
+        """Per-turn context: active tokens plus the recent history window"""
+        if self._context_cache is not None and self._context_cache[0] == self._context_version:
+            return self._context_cache[1]
+
         context_parts = [
-            "You are participating in a NeuroGlyph conversation through the HyRI platform.",
-            "NeuroGlyph is a structured protocol for human-AI dialogue.",
             f"Active context: {self.active_context.get('/context', 'General dialogue')}",
             f"Current focus: {self.active_context.get('/focus', 'Open discussion')}",
             f"Participants: {self.active_context.get('/mind', 'Unknown')}",
             "",
             "Recent conversation history:"
         ]
-        
-        # Add last 3 messages for context
-        for msg in self.conversation_history[-3:]:
+
+        # Add last 3 messages for context (deques don't support slicing)
+        for msg in list(self.conversation_history)[-3:]:
             context_parts.append(f"[{msg.agent}]: {msg.raw_text}")
-        
-        context_parts.extend([
-            "",
-            "Please respond using NeuroGlyph protocol with appropriate tokens.",
-            "Be conversational but maintain the structured format.",
-            "Include meaningful content beyond just the protocol structure."
-        ])
-        
-        return "\n".join(context_parts)
+
+        tail = "\n".join(context_parts)
+        self._context_cache = (self._context_version, tail)
+        return tail
+
+    def get_conversation_context(self) -> str:
+        """Build context string for AI agents (stable preamble + volatile tail)"""
+        return STATIC_PREAMBLE + "\n\n" + self._volatile_tail()
     
     def get_gpt_response(self, prompt: str) -> str:
         """Get response from GPT using NeuroGlyph context"""
         if not self.openai_client:
             return "GPT Error: API client not initialized. Please check your OpenAI API key."
-        
+
+        context = self.get_conversation_context()
+        key = self._cache_key("gpt-4", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
             response = self.openai_client.chat.completions.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": self.get_conversation_context()},
+                    {"role": "system", "content": context},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=500,
                 temperature=0.7
             )
-            return response.choices[0].message.content
+            result = response.choices[0].message.content
+            self._cache_put(key, result)
+            return result
         except Exception as e:
             return f"GPT Error: {str(e)}"
     
@@ -231,27 +535,200 @@ class HyRIEngine:
         """Get response from Claude using NeuroGlyph context"""
         if not self.anthropic_client:
             return "Claude Error: API client not initialized. Please check your Anthropic API key."
-        
+
+        context = self.get_conversation_context()
+        key = self._cache_key("claude-3-sonnet-20240229", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
             message = self.anthropic_client.messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=500,
+                # Static preamble in a cacheable block; only the short
+                # volatile tail is reprocessed on repeat turns
+                system=[
+                    {"type": "text", "text": STATIC_PREAMBLE,
+                     "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": self._volatile_tail()}
+                ],
                 messages=[
                     {
-                        "role": "user", 
-                        "content": f"{self.get_conversation_context()}\n\nHuman message: {prompt}"
+                        "role": "user",
+                        "content": f"Human message: {prompt}"
                     }
                 ]
             )
-            return message.content[0].text
+            result = message.content[0].text
+            self._cache_put(key, result)
+            return result
         except Exception as e:
             return f"Claude Error: {str(e)}"
-    
+
+    async def _gpt_async(self, prompt: str) -> str:
+        """Async GPT call (mirrors get_gpt_response)"""
+        if not self.openai_async:
+            return "GPT Error: API client not initialized. Please check your OpenAI API key."
+
+        context = self.get_conversation_context()
+        key = self._cache_key("gpt-4", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.openai_async.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": context},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.7
+            )
+            result = response.choices[0].message.content
+            self._cache_put(key, result)
+            return result
+        except Exception as e:
+            return f"GPT Error: {str(e)}"
+
+    async def _claude_async(self, prompt: str) -> str:
+        """Async Claude call (mirrors get_claude_response)"""
+        if not self.anthropic_async:
+            return "Claude Error: API client not initialized. Please check your Anthropic API key."
+
+        context = self.get_conversation_context()
+        key = self._cache_key("claude-3-sonnet-20240229", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            message = await self.anthropic_async.messages.create(
+                model="claude-3-sonnet-20240229",
+                max_tokens=500,
+                system=[
+                    {"type": "text", "text": STATIC_PREAMBLE,
+                     "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": self._volatile_tail()}
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": f"Human message: {prompt}"
+                    }
+                ]
+            )
+            result = message.content[0].text
+            self._cache_put(key, result)
+            return result
+        except Exception as e:
+            return f"Claude Error: {str(e)}"
+
+    def stream_gpt_response(self, prompt: str):
+        """Yield GPT response text chunks as they arrive (for st.write_stream)"""
+        if not self.openai_client:
+            yield "GPT Error: API client not initialized. Please check your OpenAI API key."
+            return
+
+        context = self.get_conversation_context()
+        key = self._cache_key("gpt-4", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            stream = self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": context},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=500,
+                temperature=0.7,
+                stream=True
+            )
+            parts = []
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            self._cache_put(key, "".join(parts))
+        except Exception as e:
+            yield f"GPT Error: {str(e)}"
+
+    def stream_claude_response(self, prompt: str):
+        """Yield Claude response text chunks as they arrive (for st.write_stream)"""
+        if not self.anthropic_client:
+            yield "Claude Error: API client not initialized. Please check your Anthropic API key."
+            return
+
+        context = self.get_conversation_context()
+        key = self._cache_key("claude-3-sonnet-20240229", context, prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            parts = []
+            with self.anthropic_client.messages.stream(
+                model="claude-3-sonnet-20240229",
+                max_tokens=500,
+                system=[
+                    {"type": "text", "text": STATIC_PREAMBLE,
+                     "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": self._volatile_tail()}
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": f"Human message: {prompt}"
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+            self._cache_put(key, "".join(parts))
+        except Exception as e:
+            yield f"Claude Error: {str(e)}"
+
+    async def _both_async(self, prompt: str):
+        # Build the async clients inside the running loop and close them
+        # before it shuts down; a pooled connection reused on a later
+        # click would otherwise be bound to an already-closed loop
+        if self._openai_key:
+            import openai
+            self.openai_async = openai.AsyncOpenAI(api_key=self._openai_key)
+        if self._anthropic_key:
+            import anthropic
+            self.anthropic_async = anthropic.AsyncAnthropic(api_key=self._anthropic_key)
+
+        try:
+            return await asyncio.gather(self._gpt_async(prompt), self._claude_async(prompt))
+        finally:
+            if self.openai_async:
+                await self.openai_async.close()
+            if self.anthropic_async:
+                await self.anthropic_async.close()
+            self.openai_async = None
+            self.anthropic_async = None
+
+    def get_both_responses(self, prompt: str):
+        """Run GPT and Claude concurrently; wall time is the slower call"""
+        return asyncio.run(self._both_async(prompt))
+
     def add_message(self, text: str, agent: str, agent_type: AgentType) -> NeuroGlyphMessage:
         """Add a message to the conversation"""
         message = self.parser.parse_message(text, agent, agent_type)
         self.conversation_history.append(message)
-        
+        self._context_version += 1
+        self._count_message(message)
+        self._log_message(message)
+
         # Update active context with new information
         if '/context' in message.tokens:
             self.active_context['/context'] = message.tokens['/context']
@@ -260,6 +737,35 @@ class HyRIEngine:
         
         return message
 
+# Display icon per agent type; one dict lookup instead of an if/elif
+# ladder per message per rerun
+AGENT_ICON = {AgentType.HUMAN: "👤", AgentType.GPT: "🤖", AgentType.CLAUDE: "🎭"}
+
+@st.cache_data(hash_funcs={NeuroGlyphMessage: lambda m: m.timestamp_ns})
+def render_message(msg: NeuroGlyphMessage) -> str:
+    """Build the markdown block for one message, memoized across reruns.
+
+    Messages are immutable after parsing, so the timestamp is a stable
+    cache key; only new messages pay the string-building cost.
+    """
+    icon = AGENT_ICON.get(msg.agent_type, "⚙️")
+
+    parts = [f"{icon} **{msg.agent}** *({msg.timestamp.split('T')[1][:8]})*"]
+
+    if msg.rendered_tokens:
+        parts.extend(f"- **{emoji}** {value}"
+                     for emoji, value in msg.rendered_tokens)
+    else:
+        parts.append(msg.raw_text)
+
+    if not msg.is_valid and msg.validation_errors:
+        parts.append(f"> ⚠️ Validation: {', '.join(msg.validation_errors)}")
+
+    # Trailing rule replaces a separate st.divider() call per message
+    parts.append("\n---")
+
+    return "\n".join(parts)
+
 # Initialize session state
 if 'hyri_engine' not in st.session_state:
     st.session_state.hyri_engine = HyRIEngine()
@@ -346,38 +852,14 @@ def main():
         st.header("💬 Conversation History")
         
         for msg in st.session_state.hyri_engine.conversation_history:
-            with st.container():
-                cols = st.columns([1, 8, 1])
-                
-                with cols[0]:
-                    if msg.agent_type == AgentType.HUMAN:
-                        st.markdown("👤")
-                    elif msg.agent_type == AgentType.GPT:
-                        st.markdown("🤖")
-                    elif msg.agent_type == AgentType.CLAUDE:
-                        st.markdown("🎭")
-                    else:
-                        st.markdown("⚙️")
-                
-                with cols[1]:
-                    st.markdown(f"**{msg.agent}** *({msg.timestamp.split('T')[1][:8]})*")
-                    
-                    # Parse and display tokens nicely
-                    if msg.tokens:
-                        for token, value in msg.tokens.items():
-                            emoji = st.session_state.hyri_engine.parser.SLASH_TO_EMOJI.get(token, token)
-                            st.markdown(f"**{emoji}** {value}")
-                    else:
-                        st.markdown(msg.raw_text)
-                    
-                    if not msg.is_valid and msg.validation_errors:
-                        st.warning(f"⚠️ Validation: {', '.join(msg.validation_errors)}")
-                
-                with cols[2]:
-                    if st.button("📋", key=f"copy_{len(st.session_state.hyri_engine.conversation_history)}_{msg.timestamp}"):
-                        st.code(msg.raw_text)
-                
-                st.divider()
+            cols = st.columns([9, 1])
+
+            with cols[0]:
+                st.markdown(render_message(msg))
+
+            with cols[1]:
+                if st.button("📋", key=f"copy_{msg.timestamp_ns}"):
+                    st.code(msg.raw_text)
         
         # Message input area
         st.header("✍️ Compose Message")
@@ -433,45 +915,43 @@ def main():
         
         with col2:
             if st.button("🤖 Get GPT Response") and st.session_state.hyri_engine.openai_client:
-                with st.spinner("GPT-4 thinking..."):
-                    gpt_response = st.session_state.hyri_engine.get_gpt_response(
+                # Stream tokens as they arrive instead of blocking on the
+                # full completion behind a spinner
+                gpt_response = st.write_stream(
+                    st.session_state.hyri_engine.stream_gpt_response(
                         message_text or "Continue the conversation"
                     )
-                    gpt_msg = st.session_state.hyri_engine.add_message(
-                        gpt_response, "GPT-4", AgentType.GPT
-                    )
+                )
+                gpt_msg = st.session_state.hyri_engine.add_message(
+                    gpt_response, "GPT-4", AgentType.GPT
+                )
                 st.rerun()
-        
+
         with col3:
             if st.button("🎭 Get Claude Response") and st.session_state.hyri_engine.anthropic_client:
-                with st.spinner("Claude thinking..."):
-                    claude_response = st.session_state.hyri_engine.get_claude_response(
+                claude_response = st.write_stream(
+                    st.session_state.hyri_engine.stream_claude_response(
                         message_text or "Continue the conversation"
                     )
-                    claude_msg = st.session_state.hyri_engine.add_message(
-                        claude_response, "Claude", AgentType.CLAUDE
-                    )
+                )
+                claude_msg = st.session_state.hyri_engine.add_message(
+                    claude_response, "Claude", AgentType.CLAUDE
+                )
                 st.rerun()
         
         with col4:
             if st.button("🔄 Both Agents"):
-                if st.session_state.hyri_engine.openai_client:
-                    with st.spinner("Getting responses..."):
-                        gpt_response = st.session_state.hyri_engine.get_gpt_response(
-                            message_text or "Continue the conversation"
-                        )
-                        st.session_state.hyri_engine.add_message(
-                            gpt_response, "GPT-4", AgentType.GPT
-                        )
-                
-                if st.session_state.hyri_engine.anthropic_client:
-                    claude_response = st.session_state.hyri_engine.get_claude_response(
+                engine = st.session_state.hyri_engine
+                with st.spinner("Getting responses..."):
+                    gpt_response, claude_response = engine.get_both_responses(
                         message_text or "Continue the conversation"
                     )
-                    st.session_state.hyri_engine.add_message(
-                        claude_response, "Claude", AgentType.CLAUDE
-                    )
-                
+
+                if engine.openai_client:
+                    engine.add_message(gpt_response, "GPT-4", AgentType.GPT)
+                if engine.anthropic_client:
+                    engine.add_message(claude_response, "Claude", AgentType.CLAUDE)
+
                 st.rerun()
         
         # Analytics and Export
@@ -482,21 +962,19 @@ def main():
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Messages", len(st.session_state.hyri_engine.conversation_history))
+                # Counter sum, not len(history): the render deque is capped
+                # at 200 while the counters cover the whole session
+                st.metric("Total Messages",
+                          st.session_state.hyri_engine.n_human + st.session_state.hyri_engine.n_ai)
             
             with col2:
-                human_msgs = sum(1 for msg in st.session_state.hyri_engine.conversation_history 
-                               if msg.agent_type == AgentType.HUMAN)
-                st.metric("Human Messages", human_msgs)
-            
+                st.metric("Human Messages", st.session_state.hyri_engine.n_human)
+
             with col3:
-                ai_msgs = len(st.session_state.hyri_engine.conversation_history) - human_msgs
-                st.metric("AI Messages", ai_msgs)
-            
+                st.metric("AI Messages", st.session_state.hyri_engine.n_ai)
+
             with col4:
-                invalid_msgs = sum(1 for msg in st.session_state.hyri_engine.conversation_history 
-                                 if not msg.is_valid)
-                st.metric("Validation Warnings", invalid_msgs)
+                st.metric("Validation Warnings", st.session_state.hyri_engine.n_invalid)
             
             # Export options
             st.subheader("📁 Export Conversation")
@@ -505,17 +983,11 @@ def main():
             
             with col1:
                 if st.button("📄 Export as JSON"):
-                    data = {
-                        'conversation_id': datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
-                        'active_context': st.session_state.hyri_engine.active_context,
-                        'messages': [asdict(msg) for msg in st.session_state.hyri_engine.conversation_history]
-                    }
-                    
-                    json_str = json.dumps(data, indent=2, ensure_ascii=False)
+                    json_str = st.session_state.hyri_engine.export_json()
                     st.download_button(
                         "Download JSON",
                         json_str,
-                        f"hyri_conversation_{data['conversation_id']}.json",
+                        f"hyri_conversation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                         "application/json"
                     )
             